@@ -1,5 +1,5 @@
 from .exceptions import CancelledError, InvalidStateError, TimeoutError  # noqa: F401
-from .executor import AsyncExecutor
+from .executor import AsyncExecutor, AsyncExecutorPool
 
 
 try:
@@ -35,35 +35,77 @@ Output:
     result 2: ((2,), {'b': 2})
 """
 import asyncio
+import atexit
+import os
+import time
+import weakref
 from concurrent.futures import Executor, Future, ThreadPoolExecutor
-from itertools import count
-from threading import Thread, get_ident, main_thread
-from typing import Awaitable, Callable, Optional, Set
+from contextvars import Context, copy_context
+from itertools import cycle
+from threading import Lock, Thread, get_ident, main_thread
+from typing import Any, Callable, Coroutine, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 from .exceptions import AsyncExecutorError, InvalidStateError
 
 
+try:
+    from uvloop import new_event_loop as _new_event_loop  # type: ignore
+except ImportError:
+    from asyncio import new_event_loop as _new_event_loop
+
+
+_FINALIZE_TIMEOUT = 5.0
+_executors: 'weakref.WeakSet[AsyncExecutor]' = weakref.WeakSet()
+
+
 class AsyncExecutor(Executor):
     """The executor that runs coroutines in a different thread."""
     _loop: asyncio.AbstractEventLoop
-    _counter = count()
 
-    def __init__(self, executor: Optional[ThreadPoolExecutor] = None) -> None:
-        self._loop = asyncio.new_event_loop()
-        self._name = f'{self.__class__.__name__}-{next(self._counter)}'
+    def __init__(
+        self,
+        executor: Optional[ThreadPoolExecutor] = None,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+        propagate_context: bool = True,
+    ) -> None:
+        """
+        :param executor: a thread pool executor to be used by sync_to_async
+        :param loop_factory: a callable creating an event loop for the executor's thread,
+            uvloop is used by default if it is installed
+        :param propagate_context: copy context variables of a submitting thread to a task,
+            otherwise tasks submitted from other threads start with an empty context
+        """
+        self._loop = (loop_factory or _new_event_loop)()
+        self._name = f'{self.__class__.__name__}-{id(self):x}'
         self._stopped = False
-        self._thread_executor = executor
-        self._thread = Thread(target=self._run, name=self._name, daemon=True)
+        self._thread_executor = executor or ThreadPoolExecutor(thread_name_prefix=self._name)
+        # None makes the loop copy the current context for every callback
+        self._context = None if propagate_context else Context()
+        self._pending: List[Tuple[Any, Future, Optional[Context]]] = []
+        self._pending_lock = Lock()
+        self._live: Set[asyncio.Task] = set()
+        self._live_lock = Lock()
+        # The thread must not refer to the executor, otherwise it is never garbage collected
+        self._thread = Thread(target=_run_loop, args=(self._loop, self._thread_executor), name=self._name, daemon=True)
         self._thread.start()
+        self._thread_ident = self._thread.ident
+        # The thread is a daemon, so make sure the loop is stopped and the thread pool
+        # is released when the executor is garbage collected without shutdown().
+        # At exit all remaining executors are finalized at once (see _finalize_at_exit)
+        self._finalizer = weakref.finalize(self, _finalize, self._loop, self._thread, self._thread_executor)
+        self._finalizer.atexit = False
+        _executors.add(self)
 
     def __repr__(self) -> str:
-        return f'<{self._name} stopped={self._stopped} tasks={len(self.tasks)}>'
+        return f'<{self._name} stopped={self._stopped} tasks={len(self._live)}>'
 
     @property
-    def tasks(self) -> Set[asyncio.Task]:
-        return asyncio.all_tasks(self._loop)
+    def tasks(self) -> FrozenSet[asyncio.Task]:
+        """Tasks which are not done yet."""
+        with self._live_lock:
+            return frozenset(self._live)
 
-    def submit(self, task: Callable[..., Awaitable], *args, **kwargs) -> Future:  # type: ignore[override]
+    def submit(self, task: Callable[..., Coroutine], *args, **kwargs) -> Future:  # type: ignore[override]
         """Schedule new async task.
 
         :param task: an async task to be scheduled
@@ -72,7 +114,108 @@ class AsyncExecutor(Executor):
         """
         if self._stopped:
             raise InvalidStateError(f'The task has been submitted after AsyncExecutor shutdown: {task}')
-        return self._submit(task, *args, **kwargs)
+
+        coroutine = task(*args, **kwargs) if args or kwargs else task()
+        _check_coroutine(coroutine, task)
+        future: Future = Future()
+        if get_ident() == self._thread_ident:
+            # We are already in the loop thread, so there is no need
+            # to go through the thread-safe queue and wake the loop up
+            self._spawn(coroutine, future)
+        else:
+            # AbstractEventLoop of Python 3.8 does not declare the context argument
+            self._loop.call_soon_threadsafe(  # type: ignore[call-arg]
+                self._spawn_safely, coroutine, future, context=self._context,
+            )
+        return future
+
+    def submit_nowait(self, task: Callable[..., Coroutine], *args, **kwargs) -> None:
+        """Schedule new async task without creating a future for its result.
+
+        :param task: an async task to be scheduled
+        :param args: args to pass to a task
+        :param kwargs: kwargs to pass to a task
+        """
+        if self._stopped:
+            raise InvalidStateError(f'The task has been submitted after AsyncExecutor shutdown: {task}')
+
+        coroutine = task(*args, **kwargs) if args or kwargs else task()
+        _check_coroutine(coroutine, task)
+        if get_ident() == self._thread_ident:
+            self._spawn(coroutine)
+        else:
+            self._loop.call_soon_threadsafe(self._spawn, coroutine, context=self._context)  # type: ignore[call-arg]
+
+    def submit_many(self, calls: Iterable[Tuple[Callable[..., Coroutine], Iterable, Mapping]]) -> List[Future]:
+        """Schedule a batch of async tasks waking the event loop up only once.
+
+        :param calls: (task, args, kwargs) triples to be scheduled
+        """
+        if self._stopped:
+            raise InvalidStateError('The tasks have been submitted after AsyncExecutor shutdown')
+
+        # The drain callback runs in the context of the first caller only,
+        # so every batch keeps the context it has been submitted from
+        context = copy_context() if self._context is None else None
+        batch: List[Tuple[Any, Future, Optional[Context]]] = []
+        try:
+            for task, args, kwargs in calls:
+                coroutine = task(*args, **kwargs)
+                _check_coroutine(coroutine, task)
+                batch.append((coroutine, Future(), context))
+        except BaseException:
+            for coroutine, _, _ in batch:
+                coroutine.close()
+            raise
+
+        if not batch:
+            return []
+
+        with self._pending_lock:
+            # The loop is already notified if the queue is not empty
+            notify = not self._pending
+            self._pending.extend(batch)
+
+        if notify:
+            self._loop.call_soon_threadsafe(self._drain_pending, context=self._context)  # type: ignore[call-arg]
+        return [future for _, future, _ in batch]
+
+    def map(  # type: ignore[override]
+        self,
+        fn: Callable[..., Coroutine],
+        *iterables: Iterable,
+        timeout: Optional[float] = None,
+        chunksize: int = 1,
+    ) -> Iterator:
+        """Schedule async tasks for every set of args as a single batch
+        and iterate over their results in order.
+
+        :param fn: an async task to be scheduled
+        :param iterables: iterables of args to pass to a task
+        :param timeout: max seconds to wait for all the results
+        :param chunksize: ignored, kept for compatibility with Executor
+        """
+        if timeout is not None:
+            end_time = timeout + time.monotonic()
+
+        futures = self.submit_many((fn, args, {}) for args in zip(*iterables))
+
+        def result_iterator() -> Iterator:
+            try:
+                futures.reverse()
+                while futures:
+                    future = futures.pop()
+                    try:
+                        result = future.result(None if timeout is None else end_time - time.monotonic())
+                    finally:
+                        # Does nothing if the task is done, otherwise the result will never be read
+                        future.cancel()
+                    yield result
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return result_iterator()
 
     def sync_to_async(self, task: Callable, *args) -> asyncio.Future:
         """Run sync function in a thread pool executor and make it awaitable.
@@ -82,53 +225,262 @@ class AsyncExecutor(Executor):
         """
         if self._stopped:
             raise InvalidStateError(f'The task has been submitted after AsyncExecutor shutdown: {task}')
-        return self._loop.run_in_executor(self._thread_executor, task, *args)
+        return asyncio.wrap_future(self._thread_executor.submit(task, *args), loop=self._loop)
 
     def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
         """Stop the executor and cancel tasks if needed.
 
         :param wait: wait for tasks to be finished or stop immediately
-        :param cancel_futures: notify tasks to be cancelled
+        :param cancel_futures: notify all tasks of the loop to be cancelled,
+            including the ones spawned by the submitted tasks
         """
         if self._stopped:
             return
 
         self._stopped = True
-
-        if cancel_futures:
-            self.cancel_futures()
-
-        self._submit(self._stop)
+        _stop_loop(self._loop, cancel=cancel_futures)
 
         if wait:
-            # This will wait for all tasks to complete and
-            # a thread pool executor to shut down (see self._run)
-            self._thread.join()
+            self._join()
 
     def cancel_futures(self) -> None:
         """Cancel all running tasks."""
+        # The loop's objects must be touched from the loop thread only
+        if get_ident() == self._thread_ident:
+            self._cancel_futures()
+        else:
+            try:
+                self._loop.call_soon_threadsafe(self._cancel_futures)
+            except RuntimeError:
+                # The loop is already closed, so there is nothing to cancel
+                pass
+
+    def _join(self) -> None:
+        # This will wait for all tasks to complete and
+        # a thread pool executor to shut down (see _run_loop)
+        self._thread.join()
+        self._finalizer.detach()
+
+    def _cancel_futures(self) -> None:
         for task in self.tasks:
             task.cancel()
 
-    def _run(self) -> None:
-        if get_ident() == main_thread().ident:
-            raise AsyncExecutorError('Async worker has been tried to start in the main thread')
+    def _forget(self, task: asyncio.Task) -> None:
+        with self._live_lock:
+            self._live.discard(task)
+
+    def _drain_pending(self) -> None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
 
-        if self._thread_executor:
-            self._loop.set_default_executor(self._thread_executor)
+        # A failure of one task is reported to its future and does not affect the rest
+        for coroutine, future, context in pending:
+            if context is None:
+                self._spawn_safely(coroutine, future)
+            else:
+                context.run(self._spawn_safely, coroutine, future)
 
-        asyncio.set_event_loop(self._loop)
+    def _spawn_safely(self, coroutine: Coroutine, future: Future) -> None:
+        # Runs as a loop callback, so a failure must be reported to the future,
+        # otherwise it goes to the loop's log only and the future is never done
         try:
-            self._loop.run_forever()
-        finally:
-            finalizer = asyncio.gather(*self.tasks, return_exceptions=True)
-            self._loop.run_until_complete(finalizer)
-            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
-            self._loop.close()
-
-    def _submit(self, task: Callable[..., Awaitable], *args, **kwargs) -> Future:
-        coroutine = task(*args, **kwargs)
-        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
-
-    async def _stop(self) -> None:
-        self._loop.stop()
+            self._spawn(coroutine, future)
+        except Exception as exc:
+            coroutine.close()
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exc)
+
+    def _spawn(self, coroutine: Coroutine, future: Optional[Future] = None) -> None:
+        # Tasks are created and tracked by the executor itself to avoid
+        # asking asyncio.all_tasks() for them which is slow before Python 3.14
+        task = self._loop.create_task(coroutine)
+        with self._live_lock:
+            self._live.add(task)
+        task.add_done_callback(self._forget)
+        if future is not None:
+            _chain_future(task, future)
+
+
+class AsyncExecutorPool(Executor):
+    """The executor that distributes coroutines among several AsyncExecutors
+    running their own event loops in their own threads."""
+
+    def __init__(
+        self,
+        num_loops: Optional[int] = None,
+        loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+        propagate_context: bool = True,
+    ) -> None:
+        """
+        :param num_loops: a number of executors, defaults to the number of CPUs
+        :param loop_factory: a callable creating an event loop for each executor
+        :param propagate_context: copy context variables of a submitting thread to a task
+        """
+        if num_loops is None:
+            num_loops = os.cpu_count() or 1
+        elif num_loops < 1:
+            raise ValueError('num_loops must be greater than 0')
+
+        self._executors = [
+            AsyncExecutor(loop_factory=loop_factory, propagate_context=propagate_context)
+            for _ in range(num_loops)
+        ]
+        self._next_executor = cycle(self._executors)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} executors={self._executors}>'
+
+    @property
+    def tasks(self) -> FrozenSet[asyncio.Task]:
+        """Tasks which are not done yet."""
+        return frozenset().union(*(executor.tasks for executor in self._executors))
+
+    def submit(self, task: Callable[..., Coroutine], *args, **kwargs) -> Future:  # type: ignore[override]
+        """Schedule new async task in the next executor.
+
+        :param task: an async task to be scheduled
+        :param args: args to pass to a task
+        :param kwargs: kwargs to pass to a task
+        """
+        return next(self._next_executor).submit(task, *args, **kwargs)
+
+    def submit_nowait(self, task: Callable[..., Coroutine], *args, **kwargs) -> None:
+        """Schedule new async task in the next executor without creating a future for its result.
+
+        :param task: an async task to be scheduled
+        :param args: args to pass to a task
+        :param kwargs: kwargs to pass to a task
+        """
+        next(self._next_executor).submit_nowait(task, *args, **kwargs)
+
+    def submit_many(self, calls: Iterable[Tuple[Callable[..., Coroutine], Iterable, Mapping]]) -> List[Future]:
+        """Schedule a batch of async tasks in the next executor waking its event loop up only once.
+
+        :param calls: (task, args, kwargs) triples to be scheduled
+        """
+        return next(self._next_executor).submit_many(calls)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Stop the executors and cancel tasks if needed.
+
+        :param wait: wait for tasks to be finished or stop immediately
+        :param cancel_futures: notify tasks to be cancelled
+        """
+        # Stop accepting tasks by all executors before waiting for any of them
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=cancel_futures)
+
+        if wait:
+            for executor in self._executors:
+                executor._join()
+
+    def cancel_futures(self) -> None:
+        """Cancel all running tasks."""
+        for executor in self._executors:
+            executor.cancel_futures()
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop, thread_executor: ThreadPoolExecutor) -> None:
+    if get_ident() == main_thread().ident:
+        raise AsyncExecutorError('Async worker has been tried to start in the main thread')
+
+    loop.set_default_executor(thread_executor)
+    try:
+        loop.run_forever()
+    finally:
+        tasks = asyncio.all_tasks(loop)
+        if tasks:
+            loop.run_until_complete(_wait_for_tasks(loop, tasks))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def _wait_for_tasks(loop: asyncio.AbstractEventLoop, tasks: Set[asyncio.Task]) -> asyncio.Future:
+    """Make a future which is done when all the tasks are done.
+
+    Results are not needed, so they are not gathered into a list. The waiter
+    is a plain future rather than a task, so cancelling all tasks of the loop
+    (see _cancel_all_tasks) does not cancel the waiting itself."""
+    waiter = loop.create_future()
+    remaining = len(tasks)
+
+    def _on_task_done(task: asyncio.Future) -> None:
+        nonlocal remaining
+        remaining -= 1
+        if not remaining:
+            waiter.set_result(None)
+
+    for task in tasks:
+        task.add_done_callback(_on_task_done)
+    return waiter
+
+
+def _stop_loop(loop: asyncio.AbstractEventLoop, cancel: bool = False) -> None:
+    """Stop the loop from any thread cancelling all its tasks if needed."""
+    try:
+        if cancel:
+            loop.call_soon_threadsafe(_cancel_all_tasks, loop)
+        loop.call_soon_threadsafe(loop.stop)
+    except RuntimeError:
+        # The loop is already closed
+        pass
+
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    # Not only the tracked tasks, since the loop waits for all of them to be done on stop
+    for task in asyncio.all_tasks(loop):
+        task.cancel()
+
+
+def _finalize(loop: asyncio.AbstractEventLoop, thread: Thread, executor: ThreadPoolExecutor) -> None:
+    """Stop the loop of an executor which has not been shut down
+    and release the threads of its thread pool."""
+    # Nobody can wait for the results anymore
+    _stop_loop(loop, cancel=True)
+    if thread.ident != get_ident():
+        thread.join(timeout=_FINALIZE_TIMEOUT)
+    executor.shutdown(wait=False)
+
+
+@atexit.register
+def _finalize_at_exit() -> None:
+    """Stop all executors which have not been shut down cancelling their tasks
+    and wait for their threads within a single timeout."""
+    finalizers = [executor._finalizer.detach() for executor in list(_executors)]
+    resources = [info[2] for info in finalizers if info is not None]
+    for loop, _, _ in resources:
+        _stop_loop(loop, cancel=True)
+
+    deadline = time.monotonic() + _FINALIZE_TIMEOUT
+    for _, thread, executor in resources:
+        thread.join(timeout=max(deadline - time.monotonic(), 0))
+        executor.shutdown(wait=False)
+
+
+def _check_coroutine(coroutine: Any, task: Callable) -> None:
+    if not asyncio.iscoroutine(coroutine):
+        raise TypeError(f'A coroutine object is required, {task} returned {type(coroutine).__name__}')
+
+
+def _chain_future(task: asyncio.Future, future: Future) -> None:
+    """Copy the state of the task to the concurrent future
+    and propagate the cancellation of the future back to the task."""
+    loop = task.get_loop()
+
+    def _on_task_done(task: asyncio.Future) -> None:
+        if task.cancelled():
+            future.cancel()
+        if not future.set_running_or_notify_cancel():
+            return
+        exception = task.exception()
+        if exception is None:
+            future.set_result(task.result())
+        else:
+            future.set_exception(exception)
+
+    def _on_future_done(future: Future) -> None:
+        if future.cancelled() and not loop.is_closed():
+            loop.call_soon_threadsafe(task.cancel)
+
+    task.add_done_callback(_on_task_done)
+    future.add_done_callback(_on_future_done)
@@ -1,22 +1,33 @@
 import asyncio
 import os
 from concurrent.futures import Future
-from typing import Awaitable, Callable
+from threading import Lock
+from typing import Callable, Coroutine, Optional
 
 from .executor import AsyncExecutor
 
 
 if os.getenv('AIOFUTURES_INIT'):
-    _global_executor = AsyncExecutor()
+    _global_executor: Optional[AsyncExecutor] = None
+    _global_executor_lock = Lock()
 
-    def run_async(func: Callable[..., Awaitable], *args, **kwargs) -> Future:
+    def _get_executor() -> AsyncExecutor:
+        """Create the global executor on the first use."""
+        global _global_executor
+        if _global_executor is None:
+            with _global_executor_lock:
+                if _global_executor is None:
+                    _global_executor = AsyncExecutor()
+        return _global_executor
+
+    def run_async(func: Callable[..., Coroutine], *args, **kwargs) -> Future:
         """The single entrypoint to run async tasks in another thread.
 
         :param func: an async function to run in another thread
         :param args: args to pass to a func
         :param kwargs: kwargs to pass to a func
         """
-        return _global_executor.submit(func, *args, **kwargs)
+        return _get_executor().submit(func, *args, **kwargs)
 
     def sync_to_async(func: Callable, *args) -> asyncio.Future:
         """Run sync function in a thread pool executor and make it awaitable.
@@ -24,4 +35,4 @@ if os.getenv('AIOFUTURES_INIT'):
         :param func: an async task to be scheduled
         :param args: args to pass to a task
         """
-        return _global_executor.sync_to_async(func, *args)
+        return _get_executor().sync_to_async(func, *args)
@@ -1,19 +1,60 @@
 import asyncio
+import gc
+import subprocess
 import sys
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from threading import Barrier, Event
 
 import pytest
 
-from aiofutures import AsyncExecutor, InvalidStateError, run_async, sync_to_async
+from aiofutures import (
+    AsyncExecutor,
+    AsyncExecutorPool,
+    CancelledError,
+    InvalidStateError,
+    TimeoutError,
+    run_async,
+    sync_to_async,
+)
 from tests.helpers import run_thread
 
 
+ROOT = Path(__file__).parent.parent
 SENTINEL = object()
+VAR: ContextVar = ContextVar('VAR', default=None)
 
 
 async def async_task(result):
     return result
 
 
+async def running_loop():
+    return asyncio.get_running_loop()
+
+
+async def policy_loop():
+    return asyncio.get_event_loop_policy().get_event_loop()
+
+
+async def get_var():
+    return VAR.get()
+
+
+async def block_loop(started, release):
+    started.set()
+    release.wait()
+
+
+async def spawn_child(seconds):
+    asyncio.ensure_future(asyncio.sleep(seconds))
+
+
+async def set_event(event):
+    event.set()
+
+
 async def async_with_sync_task(executor, result):
     res = await executor.sync_to_async(lambda x: x, result)
     return res
@@ -29,17 +70,258 @@ def test_submit(executor):
     assert future.result() == SENTINEL
 
 
+def test_submit_sync_function(executor):
+    with pytest.raises(TypeError):
+        executor.submit(lambda x: x, SENTINEL)
+    with pytest.raises(TypeError):
+        executor.submit_nowait(lambda x: x, SENTINEL)
+
+
+def failing_task_factory(loop, coroutine, **kwargs):
+    if coroutine.cr_frame.f_locals.get('result') is SENTINEL:
+        raise RuntimeError
+    return asyncio.Task(coroutine, loop=loop, **kwargs)
+
+
+def test_submit_reports_task_creation_error():
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(failing_task_factory)
+    executor = AsyncExecutor(loop_factory=lambda: loop)
+    with pytest.raises(RuntimeError):
+        executor.submit(async_task, SENTINEL).result(1)
+    executor.shutdown()
+
+
+def test_submit_from_loop_thread():
+    executor = AsyncExecutor(loop_factory=asyncio.new_event_loop)
+
+    def cross_thread_path(*args, **kwargs):
+        raise AssertionError('The task has been scheduled through the thread-safe queue')
+
+    async def nested_task(result):
+        loop = asyncio.get_running_loop()
+        loop.call_soon_threadsafe = cross_thread_path
+        try:
+            future = executor.submit(async_task, result)
+        finally:
+            del loop.call_soon_threadsafe
+        return await asyncio.wrap_future(future)
+
+    future = executor.submit(nested_task, SENTINEL)
+    assert future.result(1) == SENTINEL
+    executor.shutdown()
+
+
+def test_submit_nowait(executor):
+    event = Event()
+    assert executor.submit_nowait(set_event, event) is None
+    assert event.wait(1)
+
+
+def test_submit_many(executor):
+    futures = executor.submit_many((async_task, (i,), {}) for i in range(3))
+    assert [f.result() for f in futures] == [0, 1, 2]
+
+
+def test_submit_many_keeps_context_of_each_call():
+    executor = AsyncExecutor()
+    started, release = Event(), Event()
+    executor.submit_nowait(block_loop, started, release)
+    assert started.wait(1)
+
+    futures = {}
+
+    def submit(value):
+        VAR.set(value)
+        futures[value] = executor.submit_many([(get_var, (), {})])[0]
+
+    # Both batches are queued while the loop is blocked and drained at once
+    for value in ('A', 'B'):
+        run_thread(submit, value).join()
+    release.set()
+
+    assert {value: future.result(1) for value, future in futures.items()} == {'A': 'A', 'B': 'B'}
+    executor.shutdown()
+
+
+def test_submit_many_closes_coroutines_on_error(executor):
+    coroutine = async_task(SENTINEL)
+
+    def fail():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        executor.submit_many([(lambda: coroutine, (), {}), (fail, (), {})])
+    assert coroutine.cr_frame is None
+
+
+def test_submit_many_sync_function(executor):
+    coroutine = async_task(1)
+    with pytest.raises(TypeError):
+        executor.submit_many([(lambda: coroutine, (), {}), (lambda x: x, (2,), {})])
+    assert coroutine.cr_frame is None
+
+
+def test_submit_many_reports_task_creation_error():
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(failing_task_factory)
+    executor = AsyncExecutor(loop_factory=lambda: loop)
+    futures = executor.submit_many([(async_task, (1,), {}), (async_task, (SENTINEL,), {}), (async_task, (3,), {})])
+    assert futures[0].result(1) == 1
+    with pytest.raises(RuntimeError):
+        futures[1].result(1)
+    assert futures[2].result(1) == 3
+    executor.shutdown()
+
+
 def test_shortcut_run_async():
     future = run_async(async_task, SENTINEL)
     assert future.result() == SENTINEL
 
 
+def test_shortcut_executor_is_created_once(monkeypatch):
+    from aiofutures import shortcuts
+
+    monkeypatch.setattr(shortcuts, '_global_executor', None)
+    barrier = Barrier(8)
+    executors = []
+
+    def get_executor():
+        barrier.wait()
+        executors.append(shortcuts._get_executor())
+
+    for t in [run_thread(get_executor) for _ in range(8)]:
+        t.join()
+    assert len(set(map(id, executors))) == 1
+    executors[0].shutdown()
+
+
 def test_map(executor):
     result = [SENTINEL, SENTINEL]
     res_iter = executor.map(async_task, result)
     assert list(res_iter) == result
 
 
+def test_tasks_are_tracked():
+    executor = AsyncExecutor()
+    future = executor.submit(asyncio.sleep, 10)
+    # Tasks are created in FIFO order, so the first one exists when the second is done
+    executor.submit(async_task, SENTINEL).result()
+    assert len(executor.tasks) == 1
+
+    executor.cancel_futures()
+    with pytest.raises(CancelledError):
+        future.result(1)
+
+    executor.shutdown()
+    assert not executor.tasks
+
+
+def test_loop_factory():
+    loop = asyncio.new_event_loop()
+    executor = AsyncExecutor(loop_factory=lambda: loop)
+    assert executor.submit(running_loop).result() is loop
+    executor.shutdown()
+
+
+def test_pool():
+    with AsyncExecutorPool(2) as pool:
+        futures = [pool.submit(running_loop) for _ in range(4)]
+        loops = [future.result() for future in futures]
+    assert len(set(loops)) == 2
+
+
+@pytest.mark.parametrize('propagate_context, expected', [
+    (True, SENTINEL),
+    (False, None),
+])
+def test_propagate_context(propagate_context, expected):
+    executor = AsyncExecutor(propagate_context=propagate_context)
+    token = VAR.set(SENTINEL)
+    try:
+        assert executor.submit(get_var).result() is expected
+        assert executor.submit_many([(get_var, (), {})])[0].result() is expected
+    finally:
+        VAR.reset(token)
+        executor.shutdown()
+
+
+def test_map_sync_function(executor):
+    with pytest.raises(TypeError):
+        list(executor.map(lambda x: x, [SENTINEL, SENTINEL]))
+
+
+def test_map_timeout(executor):
+    res_iter = executor.map(asyncio.sleep, [10], timeout=0)
+    with pytest.raises(TimeoutError):
+        next(res_iter)
+
+
+def test_worker_thread_event_loop_is_not_set(executor):
+    # The loop is always passed explicitly, so it is not set for the thread
+    with pytest.raises(RuntimeError):
+        executor.submit(policy_loop).result()
+
+
+def test_executor_is_finalized_on_gc():
+    executor = AsyncExecutor()
+    executor.submit(async_task, SENTINEL).result()
+    thread = executor._thread
+    del executor
+    gc.collect()
+    thread.join(1)
+    assert not thread.is_alive()
+
+
+def test_shutdown_cancels_child_tasks():
+    executor = AsyncExecutor()
+    executor.submit(spawn_child, 10).result()
+    started = time.monotonic()
+    executor.shutdown(cancel_futures=True)
+    assert time.monotonic() - started < 1
+
+
+def test_cancel_futures_after_shutdown():
+    executor = AsyncExecutor()
+    executor.shutdown()
+    executor.cancel_futures()
+
+
+def test_pool_num_loops_validation():
+    with pytest.raises(ValueError):
+        AsyncExecutorPool(0)
+
+
+def test_pool_shutdown_stops_all_executors_first():
+    pool = AsyncExecutorPool(2)
+    started, release = Event(), Event()
+    pool.submit(block_loop, started, release)
+    assert started.wait(1)
+
+    t = run_thread(pool.shutdown)
+    t.join(0.1)
+    try:
+        for _ in range(2):
+            with pytest.raises(InvalidStateError):
+                pool.submit(async_task, SENTINEL)
+    finally:
+        release.set()
+        t.join()
+
+
+def test_exit_cancels_pending_tasks():
+    code = (
+        'import asyncio\n'
+        'from aiofutures import AsyncExecutor\n'
+        'executors = [AsyncExecutor() for _ in range(4)]\n'
+        'for executor in executors:\n'
+        '    executor.submit(asyncio.sleep, 100)\n'
+    )
+    started = time.monotonic()
+    subprocess.run([sys.executable, '-c', code], check=True, timeout=30, cwd=ROOT)
+    assert time.monotonic() - started < 3
+
+
 def test_sync_to_async(executor):
     future = executor.submit(async_with_sync_task, executor, SENTINEL)
     assert future.result() == SENTINEL
@@ -61,6 +343,10 @@ def test_submit_after_shutdown(wait, cancel_futures):
     executor.shutdown(wait, cancel_futures)
     with pytest.raises(InvalidStateError):
         executor.submit(async_task)
+    with pytest.raises(InvalidStateError):
+        executor.submit_nowait(async_task)
+    with pytest.raises(InvalidStateError):
+        executor.submit_many([(async_task, (), {})])
 
 
 @pytest.mark.parametrize('wait, cancel_futures', [